@@ -1,140 +1,381 @@
 import os
 os.environ["KMP_DUPLICATE_LIB_OK"]="TRUE"
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import ctranslate2
 import faster_whisper as whisper
-from moviepy.editor import VideoFileClip, concatenate_videoclips
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+import numpy as np
+from moviepy.config import get_setting
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
 import os
+import subprocess
+import tempfile
 from tqdm import tqdm
 
-def process_video_chunk(video_path, start_time, end_time, output_chunk_path):
+FFMPEG_BINARY = get_setting("FFMPEG_BINARY")
+# Output is captured, so skip the banner and per-frame progress lines
+FFMPEG_QUIET = ["-hide_banner", "-nostdin", "-nostats", "-loglevel", "error"]
+SAMPLE_RATE = 16000
+
+BATCH_SIZE = 16
+# Chunks whose loudest 100 ms frame stays below this RMS are treated as silent
+SILENCE_RMS = 0.01
+# Speech longer than Whisper's 30 second window is split so it can be batched
+VAD_OPTIONS = VadOptions(min_silence_duration_ms=500, max_speech_duration_s=30)
+WHISPER_MODEL = "base"
+FALLBACK_CODEC, FALLBACK_CODEC_PARAMS = "libx264", ["-preset", "veryfast"]
+# Chunks are cut in parallel, so each encode gets an equal share of the cores
+MAX_WORKERS = max(1, os.cpu_count() // 2)
+ENCODER_THREADS = str(max(1, os.cpu_count() // MAX_WORKERS))
+
+def _nvenc_available():
+    """
+    Check once whether ffmpeg can actually encode H.264 on an NVIDIA GPU. Builds
+    list h264_nvenc even when the driver's encode library cannot be loaded, so
+    a tiny test encode is run instead of reading the encoder list.
+    
+    Returns:
+        bool: True if a test encode with h264_nvenc succeeds
+    """
+    if ctranslate2.get_cuda_device_count() == 0:
+        return False
+    try:
+        subprocess.run([FFMPEG_BINARY, *FFMPEG_QUIET, "-f", "lavfi", "-i", "nullsrc=s=256x256:d=0.1",
+                        "-c:v", "h264_nvenc", "-f", "null", "-"],
+                       capture_output=True, check=True, timeout=30)
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        return False
+    return True
+
+_MODEL = None
+_PIPELINE = None
+_VIDEO_CODEC = None
+
+def get_video_codec():
+    """
+    Pick the H.264 encoder on first use, preferring NVENC when it works.
+    
+    Returns:
+        tuple: The ffmpeg codec name and its extra parameters
+    """
+    global _VIDEO_CODEC
+    if _VIDEO_CODEC is None:
+        if _nvenc_available():
+            _VIDEO_CODEC = ("h264_nvenc", ["-preset", "p4", "-rc", "vbr", "-cq", "23"])
+        else:
+            _VIDEO_CODEC = (FALLBACK_CODEC, FALLBACK_CODEC_PARAMS)
+    return _VIDEO_CODEC
+
+def use_fallback_codec():
+    """
+    Switch the rest of the run to libx264. Chunks are joined by stream copy, so
+    they must all come from the same encoder; process_long_video re-encodes any
+    chunk that was already written with NVENC.
+    """
+    global _VIDEO_CODEC
+    _VIDEO_CODEC = (FALLBACK_CODEC, FALLBACK_CODEC_PARAMS)
+
+def get_model():
+    """
+    Load the Whisper model on first use and keep it in memory for later chunks.
+    
+    Returns:
+        WhisperModel: The shared Whisper model
+    """
+    global _MODEL
+    if _MODEL is None:
+        if ctranslate2.get_cuda_device_count() > 0:
+            device, compute_type = "cuda", "int8_float16"
+        else:
+            device, compute_type = "cpu", "int8"
+        _MODEL = whisper.WhisperModel(WHISPER_MODEL, device=device, compute_type=compute_type)
+    return _MODEL
+
+def get_pipeline():
+    """
+    Wrap the shared Whisper model in a batched pipeline that decodes several
+    30 second windows in a single GPU call.
+    
+    Returns:
+        BatchedInferencePipeline: The shared batched transcription pipeline
+    """
+    global _PIPELINE
+    if _PIPELINE is None:
+        _PIPELINE = whisper.BatchedInferencePipeline(model=get_model())
+    return _PIPELINE
+
+def get_duration(video_path):
+    """
+    Read the container duration of a video from its header, without starting a reader.
+    
+    Args:
+        video_path (str): Path to the video file
+    
+    Returns:
+        float: Duration in seconds
+    """
+    return ffmpeg_parse_infos(video_path)["duration"]
+
+def _format_error(e):
+    """
+    Describe an exception for printing, including ffmpeg's stderr when a command failed.
+    
+    Args:
+        e (Exception): The exception to describe
+    
+    Returns:
+        str: The error message
+    """
+    if isinstance(e, subprocess.CalledProcessError) and e.stderr:
+        return f"{e}\n{e.stderr.decode(errors='replace').strip()}"
+    return str(e)
+
+def load_audio(video_path, sample_rate=SAMPLE_RATE):
+    """
+    Decode the audio track of a video into a mono float32 array via an ffmpeg pipe.
+    
+    Args:
+        video_path (str): Path to the input video file
+        sample_rate (int): Sample rate of the returned audio (Whisper expects 16 kHz)
+    
+    Returns:
+        np.ndarray: Audio samples in the range [-1.0, 1.0]
+    """
+    out = subprocess.run([FFMPEG_BINARY, *FFMPEG_QUIET, "-i", video_path, "-vn", "-ac", "1",
+                          "-ar", str(sample_rate), "-acodec", "pcm_s16le", "-f", "s16le", "pipe:1"],
+                         capture_output=True, check=True).stdout
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+def concat_videos(video_paths, output_video, temp_dir):
+    """
+    Join videos that share codec parameters using ffmpeg's concat demuxer,
+    copying the streams instead of re-encoding them.
+    
+    Args:
+        video_paths (list): Paths of the videos to join, in order
+        output_video (str): Path to save the joined video
+        temp_dir (str): Directory for the concat list; the caller removes it
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", dir=temp_dir, delete=False, encoding="utf-8") as f:
+        for path in video_paths:
+            escaped_path = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped_path}'\n")
+    subprocess.run([FFMPEG_BINARY, *FFMPEG_QUIET, "-y", "-f", "concat", "-safe", "0",
+                    "-i", f.name, "-c", "copy", "-movflags", "+faststart", output_video],
+                   capture_output=True, check=True)
+
+def group_speech(speech_timestamps, max_length):
+    """
+    Merge consecutive voiced regions into windows no longer than Whisper's input.
+    
+    Args:
+        speech_timestamps (list): Voiced regions as {"start", "end"} sample offsets, in order
+        max_length (int): Maximum window length in samples
+    
+    Returns:
+        list: The merged regions as {"start", "end"} sample offsets
+    """
+    groups = []
+    for region in speech_timestamps:
+        if groups and region["end"] - groups[-1]["start"] <= max_length:
+            groups[-1]["end"] = region["end"]
+        else:
+            groups.append({"start": region["start"], "end": region["end"]})
+    return groups
+
+def detect_speech(audio, start_time):
+    """
+    Find the voiced regions of a chunk so Whisper never sees audio that will be cut anyway.
+    
+    Args:
+        audio (np.ndarray): The chunk's 16 kHz mono audio, as returned by load_audio
+        start_time (float): Start time of the chunk in seconds
+    
+    Returns:
+        list: Regions of at most 30 seconds as {"start", "end"} sample offsets into the full audio track
+    """
+    # Skip VAD and Whisper entirely when the whole chunk is below the energy floor
+    frame_length = SAMPLE_RATE // 10
+    frames = audio[:len(audio) // frame_length * frame_length].reshape(-1, frame_length)
+    if frames.size == 0 or np.sqrt(np.mean(frames ** 2, axis=1)).max() < SILENCE_RMS:
+        return []
+    
+    speech_timestamps = get_speech_timestamps(audio, VAD_OPTIONS)
+    if not speech_timestamps:
+        return []
+    # faster-whisper 1.1.x reads clip_timestamps as sample offsets (1.2 switched to seconds)
+    offset = int(start_time * SAMPLE_RATE)
+    return [{"start": region["start"] + offset, "end": region["end"] + offset}
+            for region in group_speech(speech_timestamps, int(VAD_OPTIONS.max_speech_duration_s * SAMPLE_RATE))]
+
+def transcribe_regions(audio, clip_timestamps):
+    """
+    Transcribe the voiced regions of every chunk together, so the batched
+    pipeline fills each GPU batch with windows from across the whole video.
+    
+    Args:
+        audio (np.ndarray): The full 16 kHz mono audio track
+        clip_timestamps (list): Voiced regions as returned by detect_speech
+    
+    Returns:
+        list: Transcribed segments with word-level timestamps relative to the start of the video
+    """
+    if not clip_timestamps:
+        return []
+    segments, info = get_pipeline().transcribe(audio, 
+                            batch_size=BATCH_SIZE,
+                            clip_timestamps=clip_timestamps,
+                            initial_prompt="Umm,let me think like,hmm... Okay,here's what I'm,like,thinking.",
+                            word_timestamps=True,
+                            log_progress=True)
+    # Segments are generated lazily; decoding happens here
+    return list(segments)
+
+def process_video_chunk(video_path, video_duration, segments, start_time, end_time, output_chunk_path):
     """
     Process a chunk of video between start_time and end_time.
     
     Args:
         video_path (str): Path to the input video file
+        video_duration (float): Duration of the whole input video in seconds
+        segments (list): The transcribed segments that fall inside this chunk
         start_time (float): Start time in seconds
         end_time (float): End time in seconds
         output_chunk_path (str): Path to save the processed chunk
     
     Returns:
-        bool: True if processing was successful, False otherwise
+        str: The video codec the chunk was encoded with, or None if processing failed
     """
     try:
-        # Load the video chunk
-        video = VideoFileClip(video_path).subclip(start_time, end_time)
-        chunk_duration = video.duration
-        
-        # Save the chunk to a temporary file
-        temp_chunk_path = f"temp_chunk_{start_time}_{end_time}.mp4"
-        video.write_videofile(temp_chunk_path, codec="libx264", audio_codec="aac")
-        video.close()
-        
-        # Transcribe the chunk
-        model = whisper.WhisperModel("base", device="cuda", compute_type="float16")
-        segments, info = model.transcribe(temp_chunk_path, 
-                                initial_prompt="Umm,let me think like,hmm... Okay,here's what I'm,like,thinking.",
-                                word_timestamps=True)
+        chunk_duration = end_time - start_time
         
-        # Clean up temporary chunk file
-        os.remove(temp_chunk_path)
-        
-        # Identify silence periods
-        silence_periods = identify_silence_periods(segments, chunk_duration, threshold=0.5)
-        
-        # Adjust silence periods to account for chunk start time
-        adjusted_silence_periods = [(start + start_time, end + start_time) for start, end in silence_periods]
+        # Identify silence periods on the video's own timeline
+        silence_periods = identify_silence_periods(segments, chunk_duration, threshold=0.5, start_time=start_time)
         
         # Cut silences from the chunk
-        cut_silences(video_path, output_chunk_path, adjusted_silence_periods, start_time, end_time)
-        
-        return True
+        return cut_silences(video_path, output_chunk_path, silence_periods, start_time, end_time, video_duration)
     except Exception as e:
-        print(f"Error processing chunk from {start_time} to {end_time}: {str(e)}")
-        if os.path.exists(temp_chunk_path):
-            os.remove(temp_chunk_path)
-        return False
+        print(f"Error processing chunk from {start_time} to {end_time}: {_format_error(e)}")
+        return None
 
-def identify_silence_periods(transcription, video_duration, threshold=1.0, buffer=0.1):
+def identify_silence_periods(transcription, video_duration, threshold=1.0, buffer=0.1, start_time=0.0, edges_only=False):
     """
     Identifies silence periods in the transcription based on the threshold.
     
     Args:
-        transcription (iterable): The transcription result with word-level timestamps.
+        transcription (iterable): The transcription result with word-level timestamps; must be a
+            sequence such as a list when edges_only is set.
         threshold (float): The minimum duration of silence to be considered.
         video_duration (float): Duration of the video chunk.
+        start_time (float): Start time of the chunk on the transcription's timeline.
+        edges_only (bool): Only report the silence before the first word and after the last word,
+            e.g. to trim an intro and outro without cutting pauses in between.
     
     Returns:
         list: A list of tuples where each tuple contains the start and end time of a silence period.
     """
-    silence_periods = []
-    previous_end = 0
+    if edges_only:
+        # Walk in from both ends and stop at the first segment with words
+        first = next((segment for segment in transcription if segment.words), None)
+        last = next((segment for segment in reversed(transcription) if segment.words), None)
+        starts = np.array([first.words[0].start] if first else [], dtype=float)
+        ends = np.array([last.words[-1].end] if last else [], dtype=float)
+    else:
+        words = [word for segment in transcription if segment.words for word in segment.words]
+        starts = np.fromiter((word.start for word in words), float, count=len(words))
+        ends = np.fromiter((word.end for word in words), float, count=len(words))
+
+    # Gap between each word and the end of the word before it
+    previous_ends = np.concatenate(([start_time], ends[:-1]))
+    gaps = starts - previous_ends
+    mask = gaps > threshold
 
-    for segment in transcription:
-        for word in segment.words:
-            start_time = word.start
-            if start_time - previous_end > threshold:
-                # Ensure we don't exceed the chunk duration
-                end_time = min(start_time - buffer, video_duration)
-                if end_time > previous_end + buffer:
-                    silence_periods.append((previous_end + buffer, end_time))
-            previous_end = word.end
+    # Ensure we don't exceed the chunk duration
+    chunk_end = start_time + video_duration
+    silence_starts = previous_ends[mask] + buffer
+    silence_ends = np.minimum(starts[mask] - buffer, chunk_end)
+    keep = silence_ends > silence_starts
+    silence_periods = list(zip(silence_starts[keep].tolist(), silence_ends[keep].tolist()))
 
     # Handle the final silence period
-    if video_duration - previous_end > threshold:
-        end_time = min(video_duration - buffer, video_duration)
+    previous_end = float(ends[-1]) if len(ends) else start_time
+    if chunk_end - previous_end > threshold:
+        end_time = min(chunk_end - buffer, chunk_end)
         if end_time > previous_end + buffer:
             silence_periods.append((previous_end + buffer, end_time))
 
     return silence_periods
 
-def cut_silences(input_video, output_video, silence_periods, start_time=None, end_time=None):
+def cut_silences(input_video, output_video, silence_periods, start_time=None, end_time=None, video_duration=None):
     """
     Removes the silence periods from the video and saves the result.
     
     Args:
         input_video (str): Path to the input video file.
         output_video (str): Path to save the output video file.
-        silence_periods (list): A list of tuples indicating silence periods (start, end).
+        silence_periods (list): A list of tuples indicating silence periods (start, end) in seconds from the start of the video.
         start_time (float): Optional start time for the video chunk
         end_time (float): Optional end time for the video chunk
+        video_duration (float): Optional duration of the input video; read from the file if omitted
+    
+    Returns:
+        str: The video codec the result was encoded with, or None if cutting failed
     """
     try:
-        # Load the video
-        video = VideoFileClip(input_video)
+        if video_duration is None:
+            video_duration = get_duration(input_video)
+        range_start = 0
+        range_end = video_duration
         if start_time is not None and end_time is not None:
-            video = video.subclip(start_time, end_time)
-
-        # Create a list of clips without the silence periods
-        clips = []
-        last_end = 0
-
-        for (start, end) in silence_periods:
-            # Ensure we don't exceed the video duration
-            if start > video.duration:
-                break
-            if last_end < start:
-                clips.append(video.subclip(last_end, min(start, video.duration)))
-            last_end = min(end, video.duration)
-
-        # Add the final clip if there's any remaining video after the last silence
-        if last_end < video.duration:
-            clips.append(video.subclip(last_end, video.duration))
-
-        # Concatenate the remaining clips
-        if clips:
-            final_clip = concatenate_videoclips(clips)
-            # Write the result to a file
-            final_clip.write_videofile(output_video, codec="libx264", audio_codec="aac")
-            final_clip.close()
-        else:
-            # If no clips are left after cutting silences, save the original video
-            video.write_videofile(output_video, codec="libx264", audio_codec="aac")
-        
-        video.close()
+            range_start = start_time
+            range_end = min(end_time, video_duration)
+
+        # Keep the ranges between consecutive silence periods, clamped to the video
+        periods = np.asarray(silence_periods, dtype=float).reshape(-1, 2)
+        starts = np.concatenate(([range_start], periods[:, 1]))
+        ends = np.concatenate((periods[:, 0], [range_end]))
+        ranges = np.clip(np.stack([starts, ends], axis=1), range_start, range_end)
+        ranges = ranges[ranges[:, 1] > ranges[:, 0]].tolist()
+
+        # If no ranges are left after cutting silences, save the original video
+        if not ranges:
+            ranges = [(range_start, range_end)]
+
+        # Trim every range and concatenate them in one ffmpeg filtergraph. The input
+        # is seeked to the chunk start, so trims are relative to range_start.
+        filters = []
+        for i, (start, end) in enumerate(ranges):
+            start, end = start - range_start, end - range_start
+            filters.append(f"[0:v]trim=start={start}:end={end},setpts=PTS-STARTPTS[v{i}]")
+            filters.append(f"[0:a]atrim=start={start}:end={end},asetpts=PTS-STARTPTS[a{i}]")
+        pads = "".join(f"[v{i}][a{i}]" for i in range(len(ranges)))
+        filters.append(f"{pads}concat=n={len(ranges)}:v=1:a=1[v][a]")
+
+        # -ss before -i jumps to the nearest keyframe instead of decoding the
+        # video from the beginning; ffmpeg then discards frames up to the exact start
+        cmd = [FFMPEG_BINARY, *FFMPEG_QUIET, "-y",
+               "-ss", str(range_start), "-t", str(range_end - range_start), "-i", input_video,
+               "-filter_complex", ";".join(filters), "-map", "[v]", "-map", "[a]"]
+        video_codec, video_codec_params = get_video_codec()
+        try:
+            subprocess.run(cmd + ["-c:v", video_codec, *video_codec_params, "-threads", ENCODER_THREADS,
+                                  "-c:a", "aac", output_video],
+                           capture_output=True, check=True)
+        except subprocess.CalledProcessError:
+            if video_codec == FALLBACK_CODEC:
+                raise
+            # NVENC can still fail at runtime, e.g. when the GPU's session limit is
+            # reached; switch the whole run so all chunks share one encoder
+            use_fallback_codec()
+            video_codec, video_codec_params = get_video_codec()
+            subprocess.run(cmd + ["-c:v", video_codec, *video_codec_params, "-threads", ENCODER_THREADS,
+                                  "-c:a", "aac", output_video],
+                           capture_output=True, check=True)
+        return video_codec
     except Exception as e:
-        print(f"Error in cut_silences: {str(e)}")
-        if 'video' in locals():
-            video.close()
+        print(f"Error in cut_silences: {_format_error(e)}")
+        return None
 
 def process_long_video(input_video, output_video, chunk_duration=300):
     """
@@ -145,75 +386,82 @@ def process_long_video(input_video, output_video, chunk_duration=300):
         output_video (str): Path to save the output video file
         chunk_duration (int): Duration of each chunk in seconds (default: 300 seconds = 5 minutes)
     """
-    # Load the video to get its duration
-    video = VideoFileClip(input_video)
-    total_duration = video.duration
-    video.close()
+    # Decode the whole audio track once; chunks are views into this array.
+    # Chunk bounds follow the container duration so no video is dropped when
+    # the audio stream is shorter.
+    try:
+        audio = load_audio(input_video)
+        total_duration = get_duration(input_video)
+    except Exception as e:
+        print(f"Error reading {input_video}: {_format_error(e)}")
+        print("No chunks were successfully processed.")
+        return
     
     # Calculate number of chunks
     num_chunks = int(total_duration / chunk_duration) + (1 if total_duration % chunk_duration > 0 else 0)
     
-    # Create temporary directory for chunks
-    temp_dir = "temp_chunks"
-    os.makedirs(temp_dir, exist_ok=True)
-    
-    # Process each chunk
-    processed_chunks = []
-    for i in tqdm(range(num_chunks), desc="Processing video chunks"):
-        start_time = i * chunk_duration
-        end_time = min((i + 1) * chunk_duration, total_duration)
-        
-        # Skip if this chunk would be too short (less than 1 second)
-        if end_time - start_time < 1:
-            continue
+    # Chunks live in a temporary directory that is removed even if processing fails
+    with tempfile.TemporaryDirectory() as temp_dir:
+        chunks = []
+        for i in range(num_chunks):
+            start_time = i * chunk_duration
+            end_time = min((i + 1) * chunk_duration, total_duration)
+            
+            # Skip if this chunk would be too short (less than 1 second)
+            if end_time - start_time < 1:
+                continue
             
-        chunk_output = os.path.join(temp_dir, f"chunk_{i}.mp4")
+            chunks.append((i, start_time, end_time, os.path.join(temp_dir, f"chunk_{i}.mp4")))
+        
+        # Probe the encoder before the worker threads start so it only happens once
+        get_video_codec()
         
-        # Check if chunk already exists
-        if os.path.exists(chunk_output):
-            print(f"Chunk {i} already processed. Skipping.")
-            processed_chunks.append(chunk_output)
-            continue  # Skip processing this chunk
+        chunk_codecs = {}
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # Find the voiced regions of every chunk in parallel; threads share
+            # the audio array without copying it
+            chunk_audios = [audio[int(start_time * SAMPLE_RATE):int(end_time * SAMPLE_RATE)]
+                            for _, start_time, end_time, _ in chunks]
+            chunk_starts = [start_time for _, start_time, _, _ in chunks]
+            clip_timestamps = []
+            for regions in executor.map(detect_speech, chunk_audios, chunk_starts):
+                clip_timestamps.extend(regions)
             
-        if process_video_chunk(input_video, start_time, end_time, chunk_output):
-            processed_chunks.append(chunk_output)
-    
-    # Combine all processed chunks
-    if processed_chunks:
-        print("Combining processed chunks...")
-        final_clips = []
-        for chunk_path in processed_chunks:
-            try:
-                clip = VideoFileClip(chunk_path)
-                if clip.duration > 0:  # Only add non-empty clips
-                    final_clips.append(clip)
-                else:
-                    clip.close()
-                    os.remove(chunk_path)
-            except Exception as e:
-                print(f"Error loading chunk {chunk_path}: {str(e)}")
-                if os.path.exists(chunk_path):
-                    os.remove(chunk_path)
+            # Transcribe all chunks in one batched call
+            print("Transcribing voiced regions...")
+            segments = transcribe_regions(audio, clip_timestamps)
+            
+            # Cut each chunk in parallel
+            chunk_args = {
+                i: (input_video, total_duration,
+                    [segment for segment in segments if start_time <= segment.start < end_time],
+                    start_time, end_time, chunk_output)
+                for i, start_time, end_time, chunk_output in chunks
+            }
+            futures = {executor.submit(process_video_chunk, *args): i for i, args in chunk_args.items()}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Processing video chunks"):
+                chunk_codecs[futures[future]] = future.result()
+            
+            # The chunks are joined by stream copy, so any chunk encoded before the
+            # run switched to the fallback encoder has to be redone
+            video_codec, _ = get_video_codec()
+            stale_chunks = [i for i, codec in chunk_codecs.items() if codec is not None and codec != video_codec]
+            if stale_chunks:
+                futures = {executor.submit(process_video_chunk, *chunk_args[i]): i for i in stale_chunks}
+                for future in tqdm(as_completed(futures), total=len(futures), desc=f"Re-encoding chunks with {video_codec}"):
+                    chunk_codecs[futures[future]] = future.result()
+        
+        # Keep the chunks in their original order, dropping any that failed
+        processed_chunks = [chunk_args[i][-1] for i in sorted(chunk_codecs) if chunk_codecs[i] is not None]
         
-        if final_clips:
-            print(f"Combining {len(final_clips)} chunks...")
-            final_video = concatenate_videoclips(final_clips)
+        # Combine all processed chunks
+        if processed_chunks:
+            print(f"Combining {len(processed_chunks)} chunks...")
             print(f"Writing final video to {output_video}...")
-            final_video.write_videofile(output_video, codec="libx264", audio_codec="aac")
-            final_video.close()
-            
-            # Clean up
-            for clip in final_clips:
-                clip.close()
-            for chunk in processed_chunks:
-                if os.path.exists(chunk):
-                    os.remove(chunk)
-            os.rmdir(temp_dir)
+            concat_videos(processed_chunks, output_video, temp_dir)
             print("Processing completed successfully!")
         else:
-            print("No valid clips to combine.")
-    else:
-        print("No chunks were successfully processed.")
+            print("No chunks were successfully processed.")
 
 if __name__ == "__main__":
     video_path = "D:\\DavinciProjects\\鮑興國演算法系列\\Lecture 22_ Elementary Graph Algorithms - I_1\\Lecture 22_ Elementary Graph Algorithms - I_1.mp4"       # Path to your video file